@@ -2,15 +2,19 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
 import csv
+import functools
 import json
+import os
 import re
 import subprocess
 import sys
-from collections import defaultdict
-from dataclasses import dataclass
+import tempfile
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
 
 @dataclass(frozen=True)
@@ -21,6 +25,16 @@ class RepoNode:
     owner: Optional[str]
 
 
+@dataclass(slots=True)
+class Edge:
+    source: str
+    target: str
+    occurrences: int = 0
+    relation_type_counts: "Counter[str]" = field(default_factory=Counter)
+    owners_observed: Set[str] = field(default_factory=set)
+    evidence: List[Dict[str, object]] = field(default_factory=list)
+
+
 RG_EXCLUDES = [
     "!.git",
     "!node_modules",
@@ -31,6 +45,29 @@ RG_EXCLUDES = [
     "!.venv",
 ]
 
+# Restrict the match scan to file types that can plausibly carry repo
+# references. Type filters run inside rg's directory walker, so excluded
+# files are never even opened. Everything goes through --type-add: rg
+# intersects -t selections with positive -g globs rather than unioning
+# them, so a separate include-glob list would filter the types down
+# instead of extending them. Type globs match basenames, which covers the
+# extensionless names; workflow files are caught by the yml/yaml globs.
+RG_TYPE_FILTERS = [
+    "--type-add",
+    "dep:*.{go,py,toml,json,yaml,yml,lock,mod,ts,tsx,js,jsx,md,rst,sh,tf}",
+    "--type-add",
+    "dep:.gitmodules",
+    "--type-add",
+    "dep:Pipfile",
+    "--type-add",
+    "dep:requirements*.txt",
+    "--type-add",
+    "dep:Jenkinsfile*",
+    "-tdep",
+    "-tdocker",
+    "-tmake",
+]
+
 DEPENDENCY_REL_TYPES = {
     "go_module",
     "node_dependency",
@@ -120,28 +157,71 @@ def load_allowed_repo_names(repo_list_file: Path) -> set[str]:
     return allowed
 
 
+_BASENAME_TO_REL_TYPE = {
+    "go.mod": "go_module",
+    "package.json": "node_dependency",
+    "package-lock.json": "node_dependency",
+    "pnpm-lock.yaml": "node_dependency",
+    "yarn.lock": "node_dependency",
+    "requirements.txt": "python_dependency",
+    "pyproject.toml": "python_dependency",
+    "poetry.lock": "python_dependency",
+    "Pipfile": "python_dependency",
+    "Pipfile.lock": "python_dependency",
+    ".gitmodules": "git_submodule",
+    "Dockerfile": "container_reference",
+    "docker-compose.yaml": "container_reference",
+    "docker-compose.yml": "container_reference",
+}
+
+
 def classify_relation_type(relative_path: str) -> str:
     rel = relative_path.replace("\\", "/")
-    base = rel.split("/")[-1]
-
-    if base == "go.mod":
-        return "go_module"
-    if base in {"package.json", "package-lock.json", "pnpm-lock.yaml", "yarn.lock"}:
-        return "node_dependency"
-    if base in {"requirements.txt", "pyproject.toml", "poetry.lock", "Pipfile", "Pipfile.lock"}:
-        return "python_dependency"
-    if base == ".gitmodules":
-        return "git_submodule"
+    if rel.startswith("./"):
+        # rg reports paths relative to the "." search root.
+        rel = rel[2:]
+    rel_type = _BASENAME_TO_REL_TYPE.get(rel.rsplit("/", 1)[-1])
+    if rel_type:
+        return rel_type
     if rel.startswith(".github/workflows/"):
         return "github_action"
-    if base in {"Dockerfile", "docker-compose.yaml", "docker-compose.yml"}:
-        return "container_reference"
     return "reference"
 
 
-def chunked(items: Sequence[str], chunk_size: int) -> Iterable[List[str]]:
-    for i in range(0, len(items), chunk_size):
-        yield list(items[i : i + chunk_size])
+def iter_rg_files(repo_dir: Path, name_globs: Sequence[str]) -> Iterator[Path]:
+    """
+    Enumerate files matching name_globs via rg's parallel, gitignore-aware
+    walker, honoring the same exclusions as the match scan.
+    """
+    cmd = ["rg", "--files", "--hidden"]
+    for glob in RG_EXCLUDES:
+        cmd.extend(["-g", glob])
+    for glob in name_globs:
+        cmd.extend(["-g", glob])
+    cmd.append(".")
+
+    # stderr goes to a temp file rather than a pipe: per-file warnings can
+    # exceed the pipe buffer while stdout is still being drained, which
+    # would deadlock both processes. It is read back only on failure.
+    with tempfile.TemporaryFile("w+", encoding="utf-8", errors="replace") as stderr_file:
+        proc = subprocess.Popen(
+            cmd,
+            cwd=repo_dir,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+            text=True,
+            bufsize=1,
+        )
+        assert proc.stdout is not None
+
+        for raw in proc.stdout:
+            rel = raw.rstrip("\n")
+            if rel:
+                yield repo_dir / rel
+
+        if proc.wait() not in (0, 1):
+            stderr_file.seek(0)
+            raise RuntimeError(f"rg --files failed in {repo_dir}: {stderr_file.read().strip()}")
 
 
 def collect_go_module_aliases(
@@ -156,22 +236,22 @@ def collect_go_module_aliases(
     """
     aliases: Dict[str, Set[str]] = defaultdict(set)
     module_line_re = re.compile(r"^\s*module\s+([^\s]+)\s*$")
-    semver_suffix_re = re.compile(r"^v\d+$")
 
     for repo_dir in repo_dirs:
-        for go_mod in repo_dir.rglob("go.mod"):
+        for go_mod in iter_rg_files(repo_dir, ["go.mod"]):
+            # The module directive sits at the top of the file, so stream
+            # lines and stop at the first hit instead of reading everything.
+            module_path: Optional[str] = None
             try:
-                content = go_mod.read_text(encoding="utf-8", errors="ignore")
+                with go_mod.open(encoding="utf-8", errors="ignore") as f:
+                    for line in f:
+                        m = module_line_re.match(line)
+                        if m:
+                            module_path = m.group(1).strip()
+                            break
             except OSError:
                 continue
 
-            module_path: Optional[str] = None
-            for line in content.splitlines():
-                m = module_line_re.match(line)
-                if m:
-                    module_path = m.group(1).strip()
-                    break
-
             if not module_path:
                 continue
 
@@ -184,7 +264,7 @@ def collect_go_module_aliases(
                 repo_name = parts[-1]
             elif (
                 len(parts) >= 2
-                and semver_suffix_re.fullmatch(parts[-1])
+                and _GO_SEMVER_SUFFIX_RE.fullmatch(parts[-1])
                 and parts[-2] in known_repo_names
             ):
                 # Module path like example.com/pkg/repo/v2 maps to repo "repo".
@@ -196,141 +276,468 @@ def collect_go_module_aliases(
     return dict(aliases)
 
 
-def build_patterns(
-    repo_names: Sequence[str],
-    org: Optional[str],
-    module_aliases: Optional[Dict[str, Set[str]]] = None,
-) -> List[str]:
-    escaped = [re.escape(name) for name in sorted(repo_names, key=len, reverse=True)]
-    alt = "|".join(escaped)
-    if not alt:
-        return []
+FrozenAliases = Tuple[Tuple[str, Tuple[str, ...]], ...]
 
-    patterns = [rf"github\.com[:/][A-Za-z0-9_.-]+/({alt})(?:\.git)?"]
-    if org:
-        org_escaped = re.escape(org)
-        patterns.append(rf"\b{org_escaped}/({alt})(?:@[\w.\-]+)?\b")
+# rg --replace template: the whole match plus every capture group the
+# patterns define, joined by a unit separator. Groups that do not exist in
+# the matching alternative expand to the empty string.
+RG_FIELD_SEP = "\x1f"
+RG_REPLACE_TEMPLATE = RG_FIELD_SEP.join(
+    ("$0", "${gowner}", "${grepo}", "${orepo}", "${alias}")
+)
 
-    alias_values: List[str] = []
-    if module_aliases:
-        for repo in repo_names:
-            for alias in sorted(module_aliases.get(repo, set())):
-                alias_values.append(alias)
-    if alias_values:
-        alias_alt = "|".join(re.escape(alias) for alias in sorted(set(alias_values), key=len, reverse=True))
-        patterns.append(rf"\b(?:{alias_alt})(?:@[\w.\-]+)?\b")
 
-    return patterns
+def _freeze_aliases(module_aliases: Optional[Dict[str, Set[str]]]) -> FrozenAliases:
+    """Convert the alias mapping into a hashable form usable as a cache key."""
+    if not module_aliases:
+        return ()
+    return tuple(
+        (repo, tuple(sorted(aliases)))
+        for repo, aliases in sorted(module_aliases.items())
+    )
+
+
+_GITHUB_REF_RE = re.compile(r"github(?:\.com[:/]|:)([A-Za-z0-9_.-]+)/([A-Za-z0-9_.-]+)")
+
+_NPM_GITHUB_SHORTHAND_RE = re.compile(r"^([A-Za-z0-9_.-]+)/([A-Za-z0-9_.-]+?)(?:\.git)?(?:#.*)?$")
+
+_GO_SEMVER_SUFFIX_RE = re.compile(r"^v\d+$")
+
+# One finding from a structured manifest: (line_no, snippet, target, owner).
+Finding = Tuple[int, str, str, Optional[str]]
+
+
+def resolve_module_path(
+    module_path: str,
+    known_repo_names: Set[str],
+    alias_to_repo: Dict[str, str],
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Map a Go module path to (repo-name, owner) if it names a known repo.
+
+    Only exact identifications count: a canonical github.com/<owner>/<repo>
+    path or a module path some local repo declared (collected as an alias).
+    Guessing from the last path segment would turn any third-party module
+    that merely ends in a local repo's name into an edge.
+    """
+    parts = [part for part in module_path.split("/") if part]
+    owner: Optional[str] = None
+    if len(parts) >= 3 and parts[0].lower() == "github.com":
+        owner = parts[1]
+        repo = parts[2].removesuffix(".git")
+        if repo in known_repo_names:
+            return repo, owner
+
+    repo = alias_to_repo.get(module_path.lower())
+    if repo:
+        return repo, owner
+    return None, None
+
+
+def parse_go_mod(
+    path: Path,
+    known_repo_names: Set[str],
+    alias_to_repo: Dict[str, str],
+) -> Iterator[Finding]:
+    """Yield findings for require and replace directives naming known repos."""
+    try:
+        lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
+    except OSError:
+        return
+
+    in_block = False
+    for line_no, line in enumerate(lines, 1):
+        stripped = line.split("//", 1)[0].strip()
+        if not stripped:
+            continue
+
+        if in_block:
+            if stripped.startswith(")"):
+                in_block = False
+                continue
+        else:
+            directive, _, rest = stripped.partition(" ")
+            if directive not in ("require", "replace"):
+                continue
+            rest = rest.strip()
+            if rest.startswith("("):
+                in_block = True
+                continue
+            stripped = rest
+
+        # A replace line names modules on both sides of "=>"; resolve each
+        # and deduplicate per target, preferring a concrete owner.
+        targets: Dict[str, Optional[str]] = {}
+        for side in stripped.split("=>"):
+            side = side.strip()
+            if not side:
+                continue
+            module_path = side.split()[0]
+            target, owner = resolve_module_path(module_path, known_repo_names, alias_to_repo)
+            if target and targets.get(target) is None:
+                targets[target] = owner
+
+        for target, owner in targets.items():
+            yield line_no, line.strip(), target, owner
+
+
+def parse_package_json(
+    path: Path,
+    known_repo_names: Set[str],
+    alias_to_repo: Dict[str, str],
+) -> Iterator[Finding]:
+    """Yield findings for dependency entries naming known repos."""
+    try:
+        text = path.read_text(encoding="utf-8", errors="ignore")
+        data = json.loads(text)
+    except (OSError, json.JSONDecodeError):
+        return
+    if not isinstance(data, dict):
+        return
+
+    lines = text.splitlines()
 
+    def locate(name: str) -> Tuple[int, str]:
+        needle = f'"{name}"'
+        for i, line in enumerate(lines, 1):
+            if needle in line:
+                return i, line.strip()
+        return 0, needle
 
-def build_extractors(
+    sections = ("dependencies", "devDependencies", "peerDependencies", "optionalDependencies")
+    for section in sections:
+        deps = data.get(section)
+        if not isinstance(deps, dict):
+            continue
+        for name, spec in deps.items():
+            if not isinstance(spec, str):
+                continue
+
+            # Only git/GitHub specs identify a repo; bare package names are
+            # registry lookups and matching them would manufacture edges
+            # for repos that happen to share a name with a public package.
+            target: Optional[str] = None
+            owner: Optional[str] = None
+            m = _GITHUB_REF_RE.search(spec)
+            if m is None:
+                # npm also accepts the bare "owner/repo(#ref)" shorthand.
+                m = _NPM_GITHUB_SHORTHAND_RE.match(spec)
+            if m:
+                repo = m.group(2).removesuffix(".git")
+                if repo in known_repo_names:
+                    target = repo
+                    owner = m.group(1)
+
+            if target:
+                line_no, snippet = locate(name)
+                yield line_no, snippet, target, owner
+
+
+def parse_requirements_txt(
+    path: Path,
+    known_repo_names: Set[str],
+    alias_to_repo: Dict[str, str],
+) -> Iterator[Finding]:
+    """Yield findings for requirement lines naming known repos."""
+    try:
+        lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
+    except OSError:
+        return
+
+    for line_no, line in enumerate(lines, 1):
+        stripped = line.split("#", 1)[0].strip()
+        if not stripped:
+            continue
+
+        # Only URL requirements identify a repo; bare names are registry
+        # lookups (see parse_package_json).
+        m = _GITHUB_REF_RE.search(stripped)
+        if m:
+            repo = m.group(2).removesuffix(".git")
+            if repo in known_repo_names:
+                yield line_no, line.strip(), repo, m.group(1)
+
+
+def parse_gitmodules(
+    path: Path,
+    known_repo_names: Set[str],
+    alias_to_repo: Dict[str, str],
+) -> Iterator[Finding]:
+    """Yield findings for submodule url entries naming known repos."""
+    try:
+        lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
+    except OSError:
+        return
+
+    for line_no, line in enumerate(lines, 1):
+        stripped = line.strip()
+        if not stripped.lower().startswith("url"):
+            continue
+        _, _, value = stripped.partition("=")
+        parsed = parse_repo_ref(value.strip())
+        if parsed and parsed[1] in known_repo_names:
+            yield line_no, stripped, parsed[1], parsed[0]
+
+
+# Manifests with deterministic structure are parsed directly instead of
+# being regex-scanned; the rg text scan excludes them.
+_STRUCTURED_PARSERS = {
+    "go.mod": parse_go_mod,
+    "package.json": parse_package_json,
+    "requirements.txt": parse_requirements_txt,
+    ".gitmodules": parse_gitmodules,
+}
+
+
+def build_rg_inputs(
     repo_names: Sequence[str],
     org: Optional[str],
     module_aliases: Optional[Dict[str, Set[str]]] = None,
-) -> List[Tuple[re.Pattern[str], Optional[Dict[str, str]]]]:
-    escaped = [re.escape(name) for name in sorted(repo_names, key=len, reverse=True)]
+) -> Tuple[List[str], Dict[str, str]]:
+    """
+    Build the rg pattern strings and the alias -> repo-name map used to
+    resolve module-path matches.
+
+    repo_names must already be ordered longest-first so the alternations
+    prefer the longest match; callers sort once up front. The patterns
+    carry named capture groups (gowner/grepo, orepo, alias) that rg
+    extracts via RG_REPLACE_TEMPLATE.
+    """
+    return _build_rg_inputs_cached(tuple(repo_names), org, _freeze_aliases(module_aliases))
+
+
+@functools.lru_cache(maxsize=None)
+def _build_rg_inputs_cached(
+    repo_names: Tuple[str, ...],
+    org: Optional[str],
+    frozen_aliases: FrozenAliases,
+) -> Tuple[List[str], Dict[str, str]]:
+    module_aliases = dict(frozen_aliases)
+    escaped = [re.escape(name) for name in repo_names]
     alt = "|".join(escaped)
     if not alt:
-        return []
+        return [], {}
+
+    patterns = [rf"github\.com[:/](?P<gowner>[A-Za-z0-9_.-]+)/(?P<grepo>{alt})(?:\.git)?"]
 
-    extractors: List[Tuple[re.Pattern[str], Optional[Dict[str, str]]]] = [
-        re.compile(
-            rf"github\.com[:/](?P<owner>[A-Za-z0-9_.-]+)/(?P<repo>{alt})(?:\.git)?",
-            re.IGNORECASE,
-        ),
-    ]
-    extractors = [(extractors[0], None)]
     if org:
         org_escaped = re.escape(org)
-        extractors.append((
-            re.compile(rf"\b{org_escaped}/(?P<repo>{alt})(?:@[\w.\-]+)?\b", re.IGNORECASE)
-        , None))
+        patterns.append(rf"\b{org_escaped}/(?P<orepo>{alt})(?:@[\w.\-]+)?\b")
 
     alias_to_repo: Dict[str, str] = {}
     alias_values: List[str] = []
-    if module_aliases:
-        for repo in repo_names:
-            for alias in sorted(module_aliases.get(repo, set())):
-                alias_values.append(alias)
-                alias_to_repo[alias.lower()] = repo
+    for repo in repo_names:
+        for alias in sorted(module_aliases.get(repo, ())):
+            alias_values.append(alias)
+            alias_to_repo[alias.lower()] = repo
 
     if alias_values:
         alias_alt = "|".join(re.escape(alias) for alias in sorted(set(alias_values), key=len, reverse=True))
-        alias_pattern = re.compile(rf"\b(?P<alias>{alias_alt})(?:@[\w.\-]+)?\b", re.IGNORECASE)
-        extractors.append((alias_pattern, alias_to_repo))
+        patterns.append(rf"\b(?P<alias>{alias_alt})(?:@[\w.\-]+)?\b")
 
-    return extractors
+    return patterns, alias_to_repo
 
 
-def iter_rg_matches(repo_dir: Path, patterns: Sequence[str]) -> Iterator[Tuple[str, int, str]]:
+def iter_rg_matches(
+    repo_dir: Path,
+    patterns: Sequence[str],
+    threads: Optional[int] = None,
+) -> Iterator[Tuple[str, int, str, str, str, str, str]]:
     if not patterns:
         return
 
-    cmd = ["rg", "--json", "-n", "-I", "-S", "--hidden"]
+    cmd = [
+        "rg",
+        "-n",
+        "--no-heading",
+        "--with-filename",
+        "-S",
+        "--hidden",
+        # Minified bundles and generated lockfiles can carry multi-MB single
+        # lines; cap what gets handed to the Python extractors, and skip
+        # checked-in blobs outright.
+        "--max-columns=500",
+        "--max-columns-preview",
+        "--max-filesize=10M",
+    ]
+    if threads is not None:
+        cmd.append(f"--threads={threads}")
+    # rg itself extracts the capture groups; Python only splits the fields.
+    cmd.extend(["-o", "-r", RG_REPLACE_TEMPLATE])
+    cmd.extend(RG_TYPE_FILTERS)
     for glob in RG_EXCLUDES:
         cmd.extend(["-g", glob])
+    # Structured manifests are parsed directly in scan_repo; the text scan
+    # only covers free-text references.
+    for base in _STRUCTURED_PARSERS:
+        cmd.extend(["-g", f"!{base}"])
     for pattern in patterns:
         cmd.extend(["-e", pattern])
     cmd.append(".")
 
-    proc = subprocess.run(
-        cmd,
-        cwd=repo_dir,
-        check=False,
-        capture_output=True,
-        text=True,
-    )
+    # Stream stdout so Python-side parsing overlaps with rg's scan and peak
+    # memory stays one line rather than the whole match set. stderr goes to
+    # a temp file rather than a pipe: per-file warnings can exceed the pipe
+    # buffer while stdout is still being drained, which would deadlock both
+    # processes. It is read back only on failure.
+    with tempfile.TemporaryFile("w+", encoding="utf-8", errors="replace") as stderr_file:
+        proc = subprocess.Popen(
+            cmd,
+            cwd=repo_dir,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+            text=True,
+            bufsize=1,
+        )
+        assert proc.stdout is not None
+
+        sep = RG_FIELD_SEP
+        for raw in proc.stdout:
+            # Output is "path:line:fields"; only the first two colons delimit.
+            parts = raw.rstrip("\n").split(":", 2)
+            if len(parts) != 3:
+                continue
+            path, line_no_str, payload = parts
+            try:
+                line_no = int(line_no_str)
+            except ValueError:
+                continue
+            fields = payload.split(sep)
+            if len(fields) != 5:
+                continue
+            matched, gowner, grepo, orepo, alias = fields
+            if path:
+                yield path, line_no, matched, gowner, grepo, orepo, alias
+
+        if proc.wait() not in (0, 1):
+            stderr_file.seek(0)
+            raise RuntimeError(f"rg failed in {repo_dir}: {stderr_file.read().strip()}")
 
-    if proc.returncode not in (0, 1):
-        raise RuntimeError(f"rg failed in {repo_dir}: {proc.stderr.strip()}")
 
-    for raw in proc.stdout.splitlines():
-        try:
-            event = json.loads(raw)
-        except json.JSONDecodeError:
+def scan_repo(
+    source_dir: Path,
+    patterns: Sequence[str],
+    alias_to_repo: Dict[str, str],
+    known_repo_names: Set[str],
+    max_evidence: int,
+) -> Dict[str, Edge]:
+    """
+    Scan one source repo and return target-name -> accumulated Edge.
+
+    Runs in a worker process; rg is pinned to one thread so the process
+    pool, not rg, decides how many cores are in use. Matches on the same
+    line are deduplicated per target, preferring a concrete owner, so
+    counts stay per-line rather than per-occurrence. Counts are batched
+    per file and merged into the edges at file boundaries, so lockfiles
+    with thousands of hits touch each edge once instead of per line.
+    """
+    source = source_dir.name
+    updates: Dict[str, Edge] = {}
+
+    # Per-file accumulators, merged by flush_file. capped_targets carries
+    # edges whose evidence is already full, so later files skip the snippet
+    # work for them entirely.
+    counts: "Counter[str]" = Counter()
+    owners: Dict[str, Set[str]] = defaultdict(set)
+    pending_evidence: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+    capped_targets: Set[str] = set()
+
+    def flush_file(file_path: str) -> None:
+        relation_type = classify_relation_type(file_path)
+        for target, count in counts.items():
+            edge = updates.get(target)
+            if edge is None:
+                edge = Edge(source=source, target=target)
+                updates[target] = edge
+
+            edge.occurrences += count
+            edge.relation_type_counts[relation_type] += count
+            edge.owners_observed.update(owners.get(target, ()))
+
+            evidence = edge.evidence
+            for line_no, snippet in pending_evidence.get(target, ()):
+                if len(evidence) >= max_evidence:
+                    break
+                evidence.append(
+                    {
+                        "file": file_path,
+                        "line": line_no,
+                        "relation_type": relation_type,
+                        "snippet": snippet,
+                    }
+                )
+            if len(evidence) >= max_evidence:
+                capped_targets.add(target)
+        counts.clear()
+        owners.clear()
+        pending_evidence.clear()
+
+    def record_line(line_no: int, matches_by_repo: Dict[str, Tuple[Optional[str], str]]) -> None:
+        for target, (owner, matched) in matches_by_repo.items():
+            if target == source:
+                continue
+            counts[target] += 1
+            if owner:
+                owners[target].add(owner)
+            if target in capped_targets:
+                continue
+            pend = pending_evidence[target]
+            if len(pend) < max_evidence:
+                # Clip lazily: targets whose evidence is already capped
+                # never pay for the strip/slice or the snippet tuple.
+                snippet = matched.strip()
+                if len(snippet) > 220:
+                    snippet = snippet[:217] + "..."
+                pend.append((line_no, snippet))
+
+    # Dependency manifests are parsed structurally: a targeted parse of a
+    # few small files replaces a regex scan over them, and the relation
+    # type still falls out of classify_relation_type on the file name.
+    for struct_path in iter_rg_files(source_dir, sorted(_STRUCTURED_PARSERS)):
+        parser = _STRUCTURED_PARSERS.get(struct_path.name)
+        if parser is None:
             continue
-        if event.get("type") != "match":
+        for line_no, snippet, target, owner in parser(struct_path, known_repo_names, alias_to_repo):
+            record_line(line_no, {target: (owner, snippet)})
+        if counts:
+            flush_file(f"./{struct_path.relative_to(source_dir)}")
+
+    current: Optional[Tuple[str, int]] = None
+    matches_by_repo: Dict[str, Tuple[Optional[str], str]] = {}
+
+    # Bind the per-line lookups once; this loop runs per rg match.
+    alias_get = alias_to_repo.get
+    for file_path, line_no, matched, gowner, grepo, orepo, alias in iter_rg_matches(
+        source_dir, patterns, threads=1
+    ):
+        repo = grepo or orepo or (alias_get(alias.lower()) if alias else None)
+        if not repo or repo not in known_repo_names:
             continue
-        data = event.get("data", {})
-        path_obj = data.get("path", {})
-        lines_obj = data.get("lines", {})
-        path = path_obj.get("text", "")
-        line_no = int(data.get("line_number", 0) or 0)
-        text = str(lines_obj.get("text", "")).rstrip("\n")
-        if path:
-            yield path, line_no, text
-
-
-def extract_targets(
-    line: str,
-    extractors: Sequence[Tuple[re.Pattern[str], Optional[Dict[str, str]]]],
-    known_repo_names: set[str],
-) -> List[Tuple[str, Optional[str]]]:
-    owners_by_repo: Dict[str, Optional[str]] = {}
-    for extractor, alias_to_repo in extractors:
-        for match in extractor.finditer(line):
-            owner: Optional[str] = None
-            repo: Optional[str]
 
-            if alias_to_repo is None:
-                repo = match.groupdict().get("repo")
-                owner = match.groupdict().get("owner")
-            else:
-                alias = match.groupdict().get("alias")
-                repo = alias_to_repo.get(alias.lower()) if alias else None
+        key = (file_path, line_no)
+        if key != current:
+            if current is not None and matches_by_repo:
+                record_line(current[1], matches_by_repo)
+                if file_path != current[0]:
+                    flush_file(current[0])
+            current = key
+            matches_by_repo = {}
 
-            if not repo:
-                continue
-            if repo in known_repo_names:
-                existing_owner = owners_by_repo.get(repo)
-                # Prefer a concrete owner over None if both patterns match.
-                if existing_owner is None and owner is not None:
-                    owners_by_repo[repo] = owner
-                elif repo not in owners_by_repo:
-                    owners_by_repo[repo] = owner
-    return sorted(owners_by_repo.items(), key=lambda item: item[0])
+        # Each target keeps its own matched text as evidence; if several
+        # patterns hit the same repo on a line, prefer the match that
+        # carries a concrete owner.
+        prev = matches_by_repo.get(repo)
+        if prev is None or (prev[0] is None and gowner):
+            matches_by_repo[repo] = (gowner or None, matched)
 
+    if current is not None and matches_by_repo:
+        record_line(current[1], matches_by_repo)
+        flush_file(current[0])
 
+    return updates
+
+
+@functools.lru_cache(maxsize=None)
 def sanitize_mermaid_id(name: str) -> str:
     cleaned = re.sub(r"[^A-Za-z0-9_]", "_", name)
     if not cleaned or cleaned[0].isdigit():
@@ -386,90 +793,75 @@ def main() -> int:
     )
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    edges: Dict[Tuple[str, str], Dict[str, object]] = {}
-    chunk_size = 120
-
-    for source_dir in repo_dirs:
-        source = source_dir.name
-        repo_name_chunks = list(chunked(sorted(known_repo_names), chunk_size))
-        for name_chunk in repo_name_chunks:
-            patterns = build_patterns(name_chunk, args.org, go_module_aliases)
-            extractors = build_extractors(name_chunk, args.org, go_module_aliases)
-            if not patterns:
-                continue
-
-            for file_path, line_no, line in iter_rg_matches(source_dir, patterns):
-                matches = extract_targets(line, extractors, known_repo_names)
-                if not matches:
-                    continue
-
-                relation_type = classify_relation_type(file_path)
-                snippet = line.strip()
-                if len(snippet) > 220:
-                    snippet = snippet[:217] + "..."
-
-                for target, owner in matches:
-                    if target == source:
-                        continue
-
-                    key = (source, target)
-                    edge = edges.get(key)
-                    if edge is None:
-                        edge = {
-                            "source": source,
-                            "target": target,
-                            "occurrences": 0,
-                            "relation_type_counts": defaultdict(int),
-                            "owners_observed": set(),
-                            "evidence": [],
-                        }
-                        edges[key] = edge
-
-                    edge["occurrences"] = int(edge["occurrences"]) + 1
-                    rtc = edge["relation_type_counts"]
-                    assert isinstance(rtc, defaultdict)
-                    rtc[relation_type] += 1
-
-                    owners_observed = edge["owners_observed"]
-                    assert isinstance(owners_observed, set)
-                    if owner:
-                        owners_observed.add(owner)
-
-                    evidence = edge["evidence"]
-                    assert isinstance(evidence, list)
-                    if len(evidence) < args.max_evidence_per_edge:
-                        evidence.append(
-                            {
-                                "file": file_path,
-                                "line": line_no,
-                                "relation_type": relation_type,
-                                "snippet": snippet,
-                            }
-                        )
+    # Edges are stored structure-of-arrays style: an integer-keyed index
+    # into parallel per-column lists. Repo ids follow sorted name order, so
+    # sorting the (source_id, target_id) keys is the cheap integer
+    # equivalent of the old sort by name pair.
+    repo_id = {name: i for i, name in enumerate(sorted(known_repo_names))}
+    edge_index: Dict[Tuple[int, int], int] = {}
+    edge_sources: List[str] = []
+    edge_targets: List[str] = []
+    edge_occurrences: List[int] = []
+    edge_rel_counts: List["Counter[str]"] = []
+    edge_owners: List[Set[str]] = []
+    edge_evidence: List[List[Dict[str, object]]] = []
+
+    # One pattern set covers every repo name: rg's multi-pattern engine
+    # handles the full alternation in a single pass, and with extraction
+    # done by rg there is no Python-side regex left to keep small.
+    repo_names_len_desc = sorted(known_repo_names, key=len, reverse=True)
+    all_patterns, alias_to_repo = build_rg_inputs(repo_names_len_desc, args.org, go_module_aliases)
+
+    # Each source repo scan is independent, so fan out across cores and
+    # merge the per-repo results serially. Edge keys embed the source name,
+    # so no two workers ever touch the same edge.
+    with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        future_to_source = {
+            pool.submit(
+                scan_repo,
+                source_dir,
+                all_patterns,
+                alias_to_repo,
+                known_repo_names,
+                args.max_evidence_per_edge,
+            ): source_dir.name
+            for source_dir in repo_dirs
+        }
+        for future in concurrent.futures.as_completed(future_to_source):
+            source = future_to_source[future]
+            source_id = repo_id[source]
+            for target, edge in future.result().items():
+                edge_index[(source_id, repo_id[target])] = len(edge_sources)
+                edge_sources.append(edge.source)
+                edge_targets.append(edge.target)
+                edge_occurrences.append(edge.occurrences)
+                edge_rel_counts.append(edge.relation_type_counts)
+                edge_owners.append(edge.owners_observed)
+                edge_evidence.append(edge.evidence)
 
     edge_list = []
-    for (_, _), edge in sorted(edges.items(), key=lambda kv: (kv[0][0], kv[0][1])):
-        relation_type_counts = dict(sorted(edge["relation_type_counts"].items()))
+    for (_, _), idx in sorted(edge_index.items()):
+        relation_type_counts = dict(sorted(edge_rel_counts[idx].items()))
         dependency_occurrences = sum(
             count for rel_type, count in relation_type_counts.items() if rel_type in DEPENDENCY_REL_TYPES
         )
-        owners_observed = sorted(edge["owners_observed"])
-        evidence = edge["evidence"]
         edge_list.append(
             {
-                "source": edge["source"],
-                "target": edge["target"],
-                "occurrences": edge["occurrences"],
+                "source": edge_sources[idx],
+                "target": edge_targets[idx],
+                "occurrences": edge_occurrences[idx],
                 "dependency_occurrences": dependency_occurrences,
                 "relation_type_counts": relation_type_counts,
-                "owners_observed": owners_observed,
-                "evidence": evidence,
+                "owners_observed": sorted(edge_owners[idx]),
+                "evidence": edge_evidence[idx],
             }
         )
 
     edges_json_path = output_dir / "edges.json"
-    edges_json_path.write_text(
-        json.dumps(
+    with edges_json_path.open("w", encoding="utf-8") as f:
+        # json.dump writes incrementally, avoiding a second full-document
+        # string next to the data it serializes.
+        json.dump(
             {
                 "repos_root": str(repos_root),
                 "org": args.org,
@@ -478,10 +870,9 @@ def main() -> int:
                 "nodes": [node.__dict__ for node in nodes],
                 "edges": edge_list,
             },
+            f,
             indent=2,
-        ),
-        encoding="utf-8",
-    )
+        )
 
     edges_csv_path = output_dir / "edges.csv"
     with edges_csv_path.open("w", newline="", encoding="utf-8") as f:
@@ -515,14 +906,16 @@ def main() -> int:
     mermaid_path = output_dir / "dependency-map.mmd"
     lines = ["graph LR"]
 
+    # Sanitize each repo name once; edges then only do dict lookups.
+    id_by_name = {node.name: sanitize_mermaid_id(node.name) for node in nodes}
     for node in sorted(nodes, key=lambda n: n.name.lower()):
-        node_id = sanitize_mermaid_id(node.name)
+        node_id = id_by_name[node.name]
         lines.append(f'  {node_id}["{node.name}"]')
 
     if edge_list:
         for edge in edge_list:
-            sid = sanitize_mermaid_id(edge["source"])
-            tid = sanitize_mermaid_id(edge["target"])
+            sid = id_by_name[edge["source"]]
+            tid = id_by_name[edge["target"]]
             type_label = ",".join(
                 f"{k}:{v}" for k, v in edge["relation_type_counts"].items()
             )